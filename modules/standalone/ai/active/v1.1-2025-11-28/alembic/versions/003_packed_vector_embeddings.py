@@ -0,0 +1,140 @@
+"""Add packed float16 vector embedding columns
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+Expand step only: adds nullable vector_embedding_packed (bytea) next to the
+existing ARRAY(Float) vector_embedding and backfills it. The ORM models keep
+reading and writing vector_embedding, so this is safe to run against a live
+service. The contract step (T049) ships in a later revision that may only run
+once every writer dual-writes both columns; it re-runs the backfill for rows
+written in between, then drops the array column and renames the packed one.
+
+Each backfill batch is committed on its own, so no lock is held across the
+whole conversion. The column is added with ADD COLUMN IF NOT EXISTS, so if a
+batch fails after the DDL has been committed, re-running the upgrade resumes
+the backfill instead of failing on a duplicate column.
+"""
+import math
+import struct
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# Tables carrying a vector_embedding column
+EMBEDDING_TABLES = ('extracted_entities', 'knowledge_graph_nodes')
+
+# Rows converted per committed batch during backfill
+BACKFILL_BATCH_SIZE = 1000
+
+# Largest finite float16 value
+FLOAT16_MAX = 65504.0
+
+
+def pack_embedding(values):
+    """
+    Pack a float sequence as little-endian float16 (readable with np.frombuffer(..., '<f2')).
+
+    Finite values outside the float16 range are clamped. Returns None for an
+    empty vector or one containing NaN/inf, so the row is left unconverted.
+    """
+    if not values or not all(math.isfinite(v) for v in values):
+        return None
+    clamped = [min(max(v, -FLOAT16_MAX), FLOAT16_MAX) for v in values]
+    return struct.pack(f'<{len(clamped)}e', *clamped)
+
+
+def backfill_packed_embeddings(bind, table: str) -> tuple[int, int]:
+    """
+    Fill vector_embedding_packed where it is NULL, in keyset-ordered batches.
+
+    Only unconverted rows are selected, so the backfill is resumable and can
+    be re-run to catch rows written after a previous pass. Each batch is
+    applied as a single UPDATE ... FROM (VALUES ...). Rows whose embedding
+    cannot be packed stay NULL and are reported; the contract revision (T049)
+    refuses to proceed while any remain.
+
+    Returns (converted, skipped) row counts.
+    """
+    converted = 0
+    skipped = 0
+    last_id = None
+
+    while True:
+        keyset = "" if last_id is None else "AND id > :last_id"
+        params = {'batch': BACKFILL_BATCH_SIZE}
+        if last_id is not None:
+            params['last_id'] = last_id
+
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, vector_embedding FROM {table} "
+                f"WHERE vector_embedding_packed IS NULL {keyset} "
+                f"ORDER BY id LIMIT :batch"
+            ),
+            params
+        ).fetchall()
+
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        packed = [(row_id, pack_embedding(embedding)) for row_id, embedding in rows]
+        packed = [(row_id, value) for row_id, value in packed if value is not None]
+        skipped += len(rows) - len(packed)
+        if not packed:
+            continue
+
+        values = ", ".join(
+            f"(CAST(:id_{i} AS uuid), CAST(:value_{i} AS bytea))" for i in range(len(packed))
+        )
+        update = sa.text(
+            f"UPDATE {table} AS t SET vector_embedding_packed = v.value "
+            f"FROM (VALUES {values}) AS v(id, value) WHERE t.id = v.id"
+        ).bindparams(*[sa.bindparam(f'value_{i}', type_=sa.LargeBinary()) for i in range(len(packed))])
+
+        update_params = {}
+        for i, (row_id, value) in enumerate(packed):
+            update_params[f'id_{i}'] = row_id
+            update_params[f'value_{i}'] = value
+
+        bind.execute(update, update_params)
+        converted += len(packed)
+
+    return converted, skipped
+
+
+def upgrade() -> None:
+    """
+    Add packed float16 embeddings alongside the ARRAY(Float) columns.
+
+    A 384-dim float8[] costs ~3KB per row and must be parsed element by
+    element; the packed form is 768 bytes and decodes zero-copy with
+    np.frombuffer(value, dtype='<f2').
+    """
+    for table in EMBEDDING_TABLES:
+        op.execute(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS vector_embedding_packed BYTEA")
+
+    # Commit the DDL and run every backfill batch in its own transaction
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for table in EMBEDDING_TABLES:
+            converted, skipped = backfill_packed_embeddings(bind, table)
+            print(f"✓ Backfilled vector_embedding_packed for {converted} rows in {table}")
+            if skipped:
+                print(f"⚠ {skipped} rows in {table} have empty or non-finite embeddings and were left NULL")
+
+
+def downgrade() -> None:
+    """
+    Remove the packed embedding columns (vector_embedding is untouched)
+    """
+    for table in EMBEDDING_TABLES:
+        op.drop_column(table, 'vector_embedding_packed')
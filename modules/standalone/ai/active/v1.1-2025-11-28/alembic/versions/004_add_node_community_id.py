@@ -0,0 +1,32 @@
+"""Add community_id to knowledge graph nodes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Add a nullable community_id written by the community detection job so
+    /graph/query can scope searches to a single cluster
+    """
+    op.add_column('knowledge_graph_nodes', sa.Column('community_id', sa.BigInteger(), nullable=True))
+    op.create_index('ix_knowledge_graph_nodes_community_id', 'knowledge_graph_nodes', ['community_id'])
+
+
+def downgrade() -> None:
+    """
+    Remove community_id
+    """
+    op.drop_index('ix_knowledge_graph_nodes_community_id', table_name='knowledge_graph_nodes')
+    op.drop_column('knowledge_graph_nodes', 'community_id')
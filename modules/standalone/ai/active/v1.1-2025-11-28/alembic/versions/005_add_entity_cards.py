@@ -0,0 +1,46 @@
+"""Add precomputed entity cards
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create entity_cards: one denormalized row per entity holding display
+    fields, top-N relationships by confidence in each direction and
+    neighbour summaries, so /graph/entity/{id} is a single keyed read
+    """
+    op.create_table('entity_cards',
+        sa.Column('entity_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('card', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('relationship_count', sa.Integer(), nullable=False),
+        sa.Column('is_stale', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column('refreshed_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.CheckConstraint('relationship_count >= 0', name='check_non_negative_relationship_count'),
+        sa.ForeignKeyConstraint(['entity_id'], ['extracted_entities.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('entity_id')
+    )
+    # Partial index so the refresh worker finds stale cards without scanning fresh ones
+    op.create_index(
+        'ix_entity_cards_is_stale', 'entity_cards', ['refreshed_at'],
+        postgresql_where=sa.text('is_stale')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entity_cards_is_stale', table_name='entity_cards')
+    op.drop_table('entity_cards')
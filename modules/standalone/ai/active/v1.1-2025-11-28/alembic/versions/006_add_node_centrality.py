@@ -0,0 +1,38 @@
+"""Add node centrality scores
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create node_centrality: one narrow row per node holding its PageRank
+    score, so the centrality job rewrites scores without touching
+    knowledge_graph_nodes and entity_search can order by score via a btree
+    """
+    op.create_table('node_centrality',
+        sa.Column('node_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.TIMESTAMP(), nullable=False),
+        sa.CheckConstraint('score >= 0', name='check_non_negative_score'),
+        sa.ForeignKeyConstraint(['node_id'], ['knowledge_graph_nodes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('node_id')
+    )
+    op.create_index('ix_node_centrality_score', 'node_centrality', ['score'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_node_centrality_score', table_name='node_centrality')
+    op.drop_table('node_centrality')
@@ -1,5 +1,7 @@
 """Contract tests for Knowledge Graph Query API"""
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from src.ai.api.main import app
@@ -258,6 +260,400 @@ class TestKnowledgeGraphAPIContract:
                 assert "text" in entity
                 assert "type" in entity
                 assert "confidence" in entity
+    
+    def test_batch_similarity_endpoint_exists(self):
+        """Test that /graph/similarity/batch endpoint exists"""
+        response = client.options("/ai/v1/graph/similarity/batch")
+        assert response.status_code in [200, 405]
+    
+    def test_batch_similarity_mixed_queries(self):
+        """Test batch similarity with text and entity_id queries"""
+        request_data = {
+            "queries": [
+                {"text": "Microsoft Corporation", "limit": 5, "confidence_threshold": 0.6},
+                {"entity_id": "550e8400-e29b-41d4-a716-446655440000", "limit": 3}
+            ]
+        }
+        
+        response = client.post("/ai/v1/graph/similarity/batch", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert "results" in data
+            assert "execution_time_ms" in data
+        
+            # One result per query, in request order, honouring per-query limit
+            assert len(data["results"]) == 2
+            assert len(data["results"][0]["similar_entities"]) <= 5
+            assert len(data["results"][1]["similar_entities"]) <= 3
+            for result in data["results"][0]["similar_entities"]:
+                assert result["entity"]["confidence"] >= 0.6
+            
+            # An unknown entity_id fails only its own item, with an explicit error
+            if "error" in data["results"][1]:
+                assert data["results"][1]["similar_entities"] == []
+                assert "error" in data["results"][1]["error"]
+                assert "message" in data["results"][1]["error"]
+    
+    def test_batch_similarity_validation(self):
+        """Test that batch size and per-query fields are validated"""
+        # Empty batch
+        response = client.post("/ai/v1/graph/similarity/batch", json={"queries": []})
+        assert response.status_code in [400, 422]
+        
+        # Too many queries
+        request_data = {"queries": [{"text": f"entity {i}"} for i in range(201)]}
+        response = client.post("/ai/v1/graph/similarity/batch", json=request_data)
+        assert response.status_code in [400, 422]
+        
+        # Query with neither entity_id nor text
+        response = client.post("/ai/v1/graph/similarity/batch", json={"queries": [{"limit": 5}]})
+        assert response.status_code in [400, 422]
+    
+    def test_graph_query_cursor_pagination(self):
+        """Test that next_cursor returns the following page without overlap"""
+        request_data = {
+            "query": "technology",
+            "query_type": "entity_search",
+            "filters": {"limit": 5}
+        }
+        
+        response = client.post("/ai/v1/graph/query", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert "next_cursor" in data
+        
+            if data["next_cursor"]:
+                next_page = client.post(
+                    "/ai/v1/graph/query",
+                    json={**request_data, "cursor": data["next_cursor"]}
+                )
+                assert next_page.status_code == 200
+        
+                first_ids = {entity["id"] for entity in data["entities"]}
+                next_ids = {entity["id"] for entity in next_page.json()["entities"]}
+                assert not first_ids & next_ids
+    
+    def test_graph_query_invalid_cursor(self):
+        """Test that a malformed cursor is rejected"""
+        request_data = {
+            "query": "technology",
+            "query_type": "entity_search",
+            "cursor": "not-a-valid-cursor"
+        }
+        
+        response = client.post("/ai/v1/graph/query", json=request_data)
+        assert response.status_code in [400, 422]
+    
+    def test_graph_query_ndjson_stream(self):
+        """Test NDJSON streaming mode returns one entity per line"""
+        request_data = {
+            "query": "technology",
+            "query_type": "entity_search"
+        }
+        
+        response = client.post(
+            "/ai/v1/graph/query",
+            json=request_data,
+            headers={"Accept": "application/x-ndjson"}
+        )
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+            records = [json.loads(line) for line in response.text.splitlines() if line.strip()]
+            assert records
+        
+            # Exactly one terminal record, written last
+            *entities, terminal = records
+            assert terminal["kind"] in ["end", "error"]
+            assert terminal["count"] == len(entities)
+        
+            for entity in entities:
+                assert entity["kind"] == "entity"
+                assert "id" in entity
+                assert "confidence" in entity
+    
+    def test_paths_endpoint_exists(self):
+        """Test that /graph/paths endpoint exists"""
+        response = client.options("/ai/v1/graph/paths")
+        assert response.status_code in [200, 405]
+    
+    def test_paths_between_entities(self):
+        """Test path finding between two entities"""
+        request_data = {
+            "source_entity_id": "550e8400-e29b-41d4-a716-446655440000",
+            "target_entity_id": "660e8400-e29b-41d4-a716-446655440001",
+            "k": 3,
+            "max_depth": 4,
+            "relationship_types": ["fund", "partner"],
+            "confidence_threshold": 0.6
+        }
+        
+        response = client.post("/ai/v1/graph/paths", json=request_data)
+        assert response.status_code in [200, 404, 500]
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert "paths" in data
+            assert "truncated" in data
+            assert "execution_time_ms" in data
+            assert len(data["paths"]) <= 3
+        
+            for path in data["paths"]:
+                assert len(path["edges"]) == len(path["nodes"]) - 1
+                assert len(path["edges"]) <= 4
+                for edge in path["edges"]:
+                    assert edge["type"] in ["fund", "partner"]
+                    assert edge["confidence"] >= 0.6
+            
+            # Paths are ranked by cost, then fewer edges, then node id sequence
+            ranking = [
+                (path["cost"], len(path["edges"]), [node["id"] for node in path["nodes"]])
+                for path in data["paths"]
+            ]
+            assert ranking == sorted(ranking)
+            
+            # The best path does not depend on k
+            single = client.post("/ai/v1/graph/paths", json={**request_data, "k": 1})
+            assert single.status_code == 200
+            if data["paths"]:
+                assert single.json()["paths"][0]["nodes"] == data["paths"][0]["nodes"]
+    
+    def test_paths_validation(self):
+        """Test that path requests are validated"""
+        # Missing target
+        response = client.post(
+            "/ai/v1/graph/paths",
+            json={"source_entity_id": "550e8400-e29b-41d4-a716-446655440000"}
+        )
+        assert response.status_code == 422
+        
+        # Depth above maximum
+        response = client.post(
+            "/ai/v1/graph/paths",
+            json={
+                "source_entity_id": "550e8400-e29b-41d4-a716-446655440000",
+                "target_entity_id": "660e8400-e29b-41d4-a716-446655440001",
+                "max_depth": 10
+            }
+        )
+        assert response.status_code == 422
+    
+    def test_subgraph_endpoint_exists(self):
+        """Test that /graph/entity/{entity_id}/subgraph endpoint exists"""
+        fake_entity_id = "550e8400-e29b-41d4-a716-446655440000"
+        response = client.get(f"/ai/v1/graph/entity/{fake_entity_id}/subgraph")
+        
+        # Should return 404 (not found) or 500 (DB error)
+        assert response.status_code in [404, 500]
+    
+    def test_subgraph_response_structure(self):
+        """Test that subgraph response is compact and respects the node budget"""
+        fake_entity_id = "550e8400-e29b-41d4-a716-446655440000"
+        response = client.get(
+            f"/ai/v1/graph/entity/{fake_entity_id}/subgraph",
+            params={"depth": 2, "max_nodes": 50, "rank_by": "degree"}
+        )
+        assert response.status_code in [200, 404, 500]
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert "nodes" in data
+            assert "edge_types" in data
+            assert "edges" in data
+            assert "truncated" in data
+            assert len(data["nodes"]) <= 50
+        
+            # Edges reference the node and type tables by index, without duplicates
+            seen = set()
+            for source, target, type_index, confidence in data["edges"]:
+                assert 0 <= source < len(data["nodes"])
+                assert 0 <= target < len(data["nodes"])
+                assert 0 <= type_index < len(data["edge_types"])
+                assert 0.0 <= confidence <= 1.0
+                assert (source, target, type_index) not in seen
+                seen.add((source, target, type_index))
+    
+    def test_subgraph_parameter_validation(self):
+        """Test that subgraph depth and node budget are validated"""
+        fake_entity_id = "550e8400-e29b-41d4-a716-446655440000"
+        
+        response = client.get(
+            f"/ai/v1/graph/entity/{fake_entity_id}/subgraph",
+            params={"max_nodes": 5000}
+        )
+        assert response.status_code == 422
+        
+        response = client.get(
+            f"/ai/v1/graph/entity/{fake_entity_id}/subgraph",
+            params={"rank_by": "pagerank"}
+        )
+        assert response.status_code == 422
+    
+    def test_graph_query_community_filter(self):
+        """Test scoping a query to a single community"""
+        request_data = {
+            "query": "AI research",
+            "query_type": "entity_search",
+            "filters": {
+                "community_id": 42,
+                "limit": 20
+            }
+        }
+        
+        response = client.post("/ai/v1/graph/query", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            for entity in response.json()["entities"]:
+                assert entity["community_id"] == 42
+    
+    def test_export_jsonl(self):
+        """Test streaming JSONL export with filters"""
+        response = client.get(
+            "/ai/v1/graph/export",
+            params={
+                "format": "jsonl",
+                "include": "edges",
+                "relationship_types": ["fund"],
+                "confidence_threshold": 0.8
+            }
+        )
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            assert response.headers["content-type"].startswith("application/x-ndjson")
+        
+            for line in response.text.splitlines():
+                if line.strip():
+                    record = json.loads(line)
+                    assert record["kind"] == "edge"
+                    assert record["type"] == "fund"
+                    assert record["confidence"] >= 0.8
+                    assert "cursor" in record
+    
+    def test_export_validation(self):
+        """Test that export parameters are validated"""
+        response = client.get("/ai/v1/graph/export", params={"format": "csv"})
+        assert response.status_code == 422
+        
+        response = client.get("/ai/v1/graph/export", params={"resume_token": "not-a-valid-token"})
+        assert response.status_code in [400, 422]
+    
+    def test_export_only_jsonl_resumable(self):
+        """Test that resume_token is rejected for GraphML and Parquet exports"""
+        for export_format in ["graphml", "parquet"]:
+            response = client.get(
+                "/ai/v1/graph/export",
+                params={"format": export_format, "resume_token": "eyJsYXN0X2lkIjogIjAifQ"}
+            )
+            assert response.status_code == 400
+    
+    def test_graph_query_explain(self):
+        """Test that explain returns the chosen execution plan"""
+        request_data = {
+            "query": "OpenAI",
+            "query_type": "entity_search",
+            "explain": True,
+            "filters": {"entity_types": ["organization"]}
+        }
+        
+        response = client.post("/ai/v1/graph/query", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            plan = response.json()["plan"]
+            assert plan["strategy"] in [
+                "index_scan", "in_memory_traversal", "vector_first", "filter_first"
+            ]
+    
+    def test_graph_query_without_explain_has_no_plan(self):
+        """Test that the plan is omitted unless explain is requested"""
+        request_data = {
+            "query": "OpenAI",
+            "query_type": "entity_search"
+        }
+        
+        response = client.post("/ai/v1/graph/query", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            assert response.json().get("plan") is None
+    
+    def test_pattern_endpoint_exists(self):
+        """Test that /graph/pattern endpoint exists"""
+        response = client.options("/ai/v1/graph/pattern")
+        assert response.status_code in [200, 405]
+    
+    def test_pattern_match(self):
+        """Test matching (organization)-[fund]->(organization)-[compete]->(organization)"""
+        request_data = {
+            "nodes": [
+                {"entity_types": ["organization"]},
+                {"entity_types": ["organization"]},
+                {"entity_types": ["organization"]}
+            ],
+            "hops": [
+                {"relationship_types": ["fund"], "confidence_threshold": 0.8},
+                {"relationship_types": ["compete"]}
+            ],
+            "limit": 10
+        }
+        
+        response = client.post("/ai/v1/graph/pattern", json=request_data)
+        assert response.status_code in [200, 500]
+        
+        if response.status_code == 200:
+            data = response.json()
+            assert "matches" in data
+            assert "truncated" in data
+            assert "execution_time_ms" in data
+            assert len(data["matches"]) <= 10
+        
+            for match in data["matches"]:
+                assert len(match["nodes"]) == 3
+                assert len(match["edges"]) == 2
+                assert match["edges"][0]["type"] == "fund"
+                assert match["edges"][0]["confidence"] >= 0.8
+                assert match["edges"][1]["type"] == "compete"
+            
+            # Matches ordered by score, ties broken by node id sequence
+            ranking = [
+                (-match["score"], [node["id"] for node in match["nodes"]])
+                for match in data["matches"]
+            ]
+            assert ranking == sorted(ranking)
+    
+    def test_pattern_validation(self):
+        """Test that malformed patterns are rejected"""
+        # Hop count must be len(nodes) - 1
+        request_data = {
+            "nodes": [{"entity_types": ["organization"]}, {"entity_types": ["organization"]}],
+            "hops": [{"relationship_types": ["fund"]}, {"relationship_types": ["compete"]}]
+        }
+        response = client.post("/ai/v1/graph/pattern", json=request_data)
+        assert response.status_code in [400, 422]
+        
+        # Single node is not a pattern
+        request_data = {
+            "nodes": [{"entity_types": ["organization"]}],
+            "hops": []
+        }
+        response = client.post("/ai/v1/graph/pattern", json=request_data)
+        assert response.status_code == 422
+        
+        # Unknown entity type
+        request_data = {
+            "nodes": [{"entity_types": ["organization"]}, {"entity_types": ["planet"]}],
+            "hops": [{"relationship_types": ["fund"]}]
+        }
+        response = client.post("/ai/v1/graph/pattern", json=request_data)
+        assert response.status_code == 422
 
 
 class TestGraphAPIIntegration: